@@ -4,7 +4,7 @@ from ase.calculators.lammpslib import LAMMPSlib
 import numpy as np
 from scipy.spatial import KDTree
 from tce.constants import LatticeStructure, STRUCTURE_TO_CUTOFF_LISTS
-from tce.topology import get_adjacency_tensors, get_three_body_tensors, get_feature_vector
+from tce.topology import get_adjacency_tensors, get_adjacency_matrices, get_three_body_tensors, get_feature_vector
 from sklearn.model_selection import train_test_split
 import matplotlib.pyplot as plt
 
@@ -53,6 +53,8 @@ def main():
         adjacency_tensors=adjacency_tensors,
         max_three_body_order=three_body_order
     )
+    # split the adjacency tensors once, rather than on every call to get_feature_vector
+    adjacency_matrices = get_adjacency_matrices(adjacency_tensors)
 
     X = np.zeros((
         num_samples,
@@ -79,7 +81,7 @@ def main():
             state_matrix[site, inverse_type_map[symbol]] = 1.0
 
         X[i, :] = get_feature_vector(
-            adjacency_tensors=adjacency_tensors,
+            adjacency_tensors=adjacency_matrices,
             three_body_tensors=three_body_tensors,
             state_matrix=state_matrix
         )
@@ -104,7 +104,7 @@ class TCECalculator(Calculator):
         if atoms is None:
             raise ValueError("please provide Atoms object")
 
-        x = computer(atoms).reshape(1, -1)
+        x = computer(atoms).reshape(1, -1).astype(np.float64)
         model = self.cluster_expansions[prop].model
         predicted = model.predict(x)
 
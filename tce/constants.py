@@ -11,7 +11,7 @@ from dataclasses import dataclass
 import logging
 
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import NDArray, ArrayLike, DTypeLike
 from scipy.spatial import KDTree
 import sparse
 
@@ -56,15 +56,33 @@ class LatticeStructure(Enum):
     r"""face-centered cubic lattice structure"""
 
 
+def frozen_array(values: ArrayLike, dtype: DTypeLike = np.float64) -> NDArray:
+
+    r"""
+    create a contiguous, read-only array. module-level constants are read on every topology computation, so we make
+    them immutable to avoid accidentally mutating shared state.
+
+    Args:
+        values (ArrayLike):
+            The values of the array.
+        dtype (DTypeLike):
+            The data type of the array. defaults to `np.float64`.
+    """
+
+    array = np.ascontiguousarray(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
 STRUCTURE_TO_ATOMIC_BASIS: Dict[LatticeStructure, NDArray[np.floating]] = {
-    LatticeStructure.SC: np.array([
+    LatticeStructure.SC: frozen_array([
         [0.0, 0.0, 0.0]
     ]),
-    LatticeStructure.BCC: np.array([
+    LatticeStructure.BCC: frozen_array([
         [0.0, 0.0, 0.0],
         [0.5, 0.5, 0.5]
     ]),
-    LatticeStructure.FCC: np.array([
+    LatticeStructure.FCC: frozen_array([
         [0.0, 0.0, 0.0],
         [0.0, 0.5, 0.5],
         [0.5, 0.0, 0.5],
@@ -75,9 +93,9 @@ r"""Mapping from lattice structure to atomic basis, i.e. positions of atoms with
 conventional unit cell"""
 
 STRUCTURE_TO_CUTOFF_LISTS: Dict[LatticeStructure, NDArray[np.floating]] = {
-    LatticeStructure.SC: np.array([1.0, np.sqrt(2.0), np.sqrt(3.0), 2.0]),
-    LatticeStructure.BCC: np.array([0.5 * np.sqrt(3.0), 1.0, np.sqrt(2.0), 0.5 * np.sqrt(11.0)]),
-    LatticeStructure.FCC: np.array([0.5 * np.sqrt(2.0), 1.0, np.sqrt(1.5), np.sqrt(2.0)])
+    LatticeStructure.SC: frozen_array([1.0, np.sqrt(2.0), np.sqrt(3.0), 2.0]),
+    LatticeStructure.BCC: frozen_array([0.5 * np.sqrt(3.0), 1.0, np.sqrt(2.0), 0.5 * np.sqrt(11.0)]),
+    LatticeStructure.FCC: frozen_array([0.5 * np.sqrt(2.0), 1.0, np.sqrt(1.5), np.sqrt(2.0)])
 }
 r"""Mapping from lattice structure to neighbor cutoffs, in units of the lattice parameter $a$"""
 
@@ -130,11 +148,11 @@ def get_three_body_labels(
         non_zero_labels.append(list(labels))
 
     non_zero_labels.sort(key=lambda x: (max(x), x))
-    return np.array(non_zero_labels)
+    return frozen_array(non_zero_labels, dtype=int)
 
 
 _STRUCTURE_TO_THREE_BODY_LABELS = {
-    LatticeStructure.SC: np.array([
+    LatticeStructure.SC: frozen_array([
         [0, 0, 1],
         [1, 1, 1],
         [0, 1, 2],
@@ -142,8 +160,8 @@ _STRUCTURE_TO_THREE_BODY_LABELS = {
         [0, 3, 3],
         [1, 1, 3],
         [2, 2, 3]
-    ]),
-    LatticeStructure.BCC: np.array([
+    ], dtype=int),
+    LatticeStructure.BCC: frozen_array([
         [0, 0, 1],
         [0, 0, 2],
         [1, 1, 2],
@@ -152,8 +170,8 @@ _STRUCTURE_TO_THREE_BODY_LABELS = {
         [0, 2, 3],
         [1, 3, 3],
         [2, 3, 3]
-    ]),
-    LatticeStructure.FCC: np.array([
+    ], dtype=int),
+    LatticeStructure.FCC: frozen_array([
         [0, 0, 0],
         [0, 0, 1],
         [0, 0, 2],
@@ -166,7 +184,7 @@ _STRUCTURE_TO_THREE_BODY_LABELS = {
         [1, 1, 3],
         [2, 2, 3],
         [3, 3, 3]
-    ])
+    ], dtype=int)
 }
 """@private"""
 
@@ -216,6 +234,33 @@ STRUCTURE_TO_THREE_BODY_LABELS = load_three_body_labels()
 r"""Mapping from lattice structure to set of three body labels"""
 
 
+def get_three_body_permutations(
+    three_body_labels: NDArray[np.integer]
+) -> tuple[tuple[tuple[int, ...], ...], ...]:
+
+    r"""
+    function to compute the distinct permutations of each set of three body labels, which are summed over when
+    computing three body tensors. e.g., the label $(0, 0, 1)$ has distinct permutations $(0, 0, 1)$, $(0, 1, 0)$, and
+    $(1, 0, 0)$. this function is called at import, with the result stored in the module-level constant
+    `STRUCTURE_TO_THREE_BODY_PERMUTATIONS`.
+
+    Args:
+        three_body_labels (NDArray[np.integer]):
+            The three body labels of a lattice structure, of shape `(number of triplets, 3)`.
+    """
+
+    return tuple(
+        tuple(sorted(set(permutations(tuple(int(label) for label in labels))))) for labels in three_body_labels
+    )
+
+
+STRUCTURE_TO_THREE_BODY_PERMUTATIONS = {
+    lattice_structure: get_three_body_permutations(labels)
+    for lattice_structure, labels in STRUCTURE_TO_THREE_BODY_LABELS.items()
+}
+r"""Mapping from lattice structure to the distinct permutations of each set of three body labels"""
+
+
 @dataclass(frozen=True, eq=True)
 class ClusterBasis:
 
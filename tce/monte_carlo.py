@@ -174,7 +174,7 @@ def monte_carlo(
         inverse_type_map[symbol] for symbol in initial_configuration.get_chemical_symbols()
     ), dtype=int)
 
-    state_matrix = np.zeros((supercell.num_sites, num_types), dtype=int)
+    state_matrix: NDArray = np.zeros((supercell.num_sites, num_types), dtype=np.int8)
     state_matrix[np.arange(supercell.num_sites), initial_types] = 1
 
     trajectory = []
@@ -183,7 +183,7 @@ def monte_carlo(
             state_matrix=state_matrix,
             max_adjacency_order=cluster_expansion.cluster_basis.max_adjacency_order,
             max_triplet_order=cluster_expansion.cluster_basis.max_triplet_order
-        )
+        ).astype(np.float64)
     )
     LOGGER.debug(f"initial energy is {energy}")
     for step in range(num_steps):
@@ -204,7 +204,7 @@ def monte_carlo(
             max_adjacency_order=cluster_expansion.cluster_basis.max_adjacency_order,
             max_triplet_order=cluster_expansion.cluster_basis.max_triplet_order
         )
-        energy_diff = cluster_expansion.model.predict(feature_diff)
+        energy_diff = cluster_expansion.model.predict(feature_diff.astype(np.float64))
         if not isinstance(energy_diff, float):
             raise ValueError(
                 "cluster_expansion.model.predict did not return a float. "
@@ -11,6 +11,7 @@ import logging
 import numpy as np
 from numpy.typing import NDArray
 from scipy.spatial import KDTree
+from scipy.sparse import csr_matrix
 import sparse
 
 from .constants import (
@@ -84,10 +85,24 @@ class Supercell:
 
         return topology.get_adjacency_tensors(
             tree=KDTree(self.positions, boxsize=self.lattice_parameter * np.array(self.size)),
-            cutoffs=[self.lattice_parameter * c for c in STRUCTURE_TO_CUTOFF_LISTS[self.lattice_structure][:max_order]],
+            cutoffs=self.lattice_parameter * STRUCTURE_TO_CUTOFF_LISTS[self.lattice_structure][:max_order],
             tolerance=tolerance
         )
 
+    @lru_cache
+    def adjacency_matrices(self, max_order: int) -> list[csr_matrix]:
+
+        r"""
+        two-body adjacency tensors $A_{ij}^{(n)}$, split into one CSR matrix per neighbor order. see
+        `tce.topology.get_adjacency_matrices`
+
+        Args:
+            max_order (int):
+                maximum nearest neighbor order
+        """
+
+        return topology.get_adjacency_matrices(self.adjacency_tensors(max_order=max_order))
+
     @lru_cache
     def three_body_tensors(self, max_order: int) -> sparse.COO:
 
@@ -108,11 +123,10 @@ class Supercell:
         except KeyError:
             labels = load_three_body_labels()[self.lattice_structure]
             LOGGER.debug(f"labels computed for {self.lattice_structure}")
-        three_body_labels = [labels[order] for order in range(max_order)]
 
         return topology.get_three_body_tensors(
             lattice_structure=self.lattice_structure,
-            adjacency_tensors=self.adjacency_tensors(max_order=np.concatenate(three_body_labels).max() + 1),
+            adjacency_tensors=self.adjacency_tensors(max_order=labels[:max_order].max() + 1),
             max_three_body_order=max_order
         )
 
@@ -121,7 +135,7 @@ class Supercell:
         state_matrix: sparse.COO,
         max_adjacency_order: int,
         max_triplet_order: int
-    ) -> NDArray[np.floating]:
+    ) -> NDArray[np.int32]:
 
         r"""
         feature vector $\mathbf{t}$ extracting topological features, i.e., number of bonds and number of triplets
@@ -137,7 +151,7 @@ class Supercell:
         """
 
         return topology.get_feature_vector(
-            adjacency_tensors=self.adjacency_tensors(max_order=max_adjacency_order),
+            adjacency_tensors=self.adjacency_matrices(max_order=max_adjacency_order),
             three_body_tensors=self.three_body_tensors(max_order=max_triplet_order),
             state_matrix=state_matrix
         )
@@ -148,7 +162,7 @@ class Supercell:
         final_state_matrix: sparse.COO,
         max_adjacency_order: int,
         max_triplet_order: int,
-    ) -> NDArray[np.floating]:
+    ) -> NDArray[np.int32]:
 
         r"""
         clever shortcut for computing feature vector difference
@@ -4,21 +4,25 @@ compute local feature differences for efficient Monte Carlo runs.
 """
 
 from itertools import permutations
-from typing import Optional, Union, TypeAlias, Callable
-from functools import wraps
+from typing import Optional, Union, TypeAlias, Callable, Sequence
+from functools import wraps, lru_cache
 import hashlib
 import logging
 
 from scipy.spatial import KDTree
+from scipy.sparse import csr_matrix
+from numba import njit, prange
 import numpy as np
 from numpy.typing import NDArray
 import sparse
-from opt_einsum import contract
+from opt_einsum import contract_expression
+from opt_einsum.contract import ContractExpression
 from ase import Atoms
 
 from .constants import (
     LatticeStructure,
-    STRUCTURE_TO_THREE_BODY_LABELS,
+    STRUCTURE_TO_THREE_BODY_PERMUTATIONS,
+    get_three_body_permutations,
     load_three_body_labels,
     ClusterBasis,
     STRUCTURE_TO_CUTOFF_LISTS
@@ -27,8 +31,46 @@ from .constants import (
 
 LOGGER = logging.getLogger(__name__)
 
+NON_INTEGER_STATE_MATRIX_MESSAGE = "State matrices must be integer-valued, e.g. one-hot encodings of the occupying types."
+"""@private"""
 
-def symmetrize(tensor: sparse.COO, axes: Optional[tuple[int, ...]] =None) -> sparse.COO:
+
+CONTRACTION_SUBSCRIPTS: dict[str, str] = {
+    "three_body": "nijk,iα,jβ,kγ->nαβγ",
+    "two_body_delta": "nij,iα,djβ->dnαβ",
+    "three_body_delta": "nijk,iα,djβ,dkγ->dnαβγ"
+}
+r"""
+Mapping from feature type to the einsum subscripts used to contract topological tensors with state matrices. the
+delta variants contract a state matrix difference against an extra leading axis $d$ of stacked state matrices.
+"""
+
+
+@lru_cache
+def get_contraction_expression(feature_type: str, *shapes: tuple[int, ...]) -> ContractExpression:
+
+    r"""
+    compile (and cache) an `opt_einsum` contraction expression for a feature type and a set of operand shapes. this
+    avoids re-running the path optimization on every contraction, which otherwise dominates the cost of the small
+    contractions performed during a Monte Carlo run. truncated contractions (see
+    `tce.topology.get_feature_vector_difference`) are cached separately, keyed on the number of active sites. since
+    the path is only found once per set of shapes, we can afford an exhaustive search for the optimal path.
+
+    Args:
+        feature_type (str):
+            The type of feature to compute, one of the keys of `tce.topology.CONTRACTION_SUBSCRIPTS`.
+        shapes (tuple[int, ...]):
+            The shapes of the operands, in the same order as the subscripts.
+    """
+
+    LOGGER.debug(f"compiling {feature_type} contraction expression for operand shapes {shapes}")
+    return contract_expression(CONTRACTION_SUBSCRIPTS[feature_type], *shapes, optimize="optimal")
+
+
+def symmetrize(
+    tensor: Union[sparse.COO, NDArray],
+    axes: Optional[tuple[int, ...]] = None
+) -> Union[sparse.COO, NDArray]:
     r"""
     symmetrize a tensor $T$:
 
@@ -38,10 +80,11 @@ def symmetrize(tensor: sparse.COO, axes: Optional[tuple[int, ...]] =None) -> spa
 
     E.g., $T_{(12)} = \frac{T_{12} + T_{21}}{2}$, or equivalently $\text{symmetrize}(T) = \frac{T + T^\intercal}{2}$
 
-    Specify the `axes` argument if you only want to symmetrize over a subset of indices
+    Specify the `axes` argument if you only want to symmetrize over a subset of indices. sparse tensors are
+    symmetrized with a single batched permutation of their coordinates, and dense tensors with a sum of transposes
 
     Args:
-        tensor (sparse.COO):
+        tensor (Union[sparse.COO, NDArray]):
             The tensor $T$ to symmetrize
         axes (tuple[int]):
             The axes over which to symmetrize. If not provided, symmetrize over all axes. Defaults to `None`.
@@ -50,9 +93,62 @@ def symmetrize(tensor: sparse.COO, axes: Optional[tuple[int, ...]] =None) -> spa
     if not axes:
         axes = tuple(range(tensor.ndim))
 
+    def axis_order(perm: tuple[int, ...]) -> list[int]:
+        # only permute the symmetrized axes, leaving e.g. a leading neighbor order axis in place
+        order = list(range(tensor.ndim))
+        for axis, new_axis in zip(axes, perm):
+            order[axis] = new_axis
+        return order
+
     perms = list(permutations(axes))
 
-    return sum(sparse.moveaxis(tensor, axes, perm) for perm in perms) / len(perms)
+    if isinstance(tensor, sparse.COO):
+        # permute the coordinates for every permutation at once, and let the constructor sum the duplicates. this sorts
+        # the coordinates once, rather than once per transpose and addition
+        summed = sparse.COO(
+            coords=np.concatenate([tensor.coords[axis_order(perm)] for perm in perms], axis=1),
+            data=np.tile(tensor.data, len(perms)),
+            shape=tensor.shape,
+            has_duplicates=True
+        )
+        return summed / len(perms)
+
+    return sum(tensor.transpose(axis_order(perm)) for perm in perms) / len(perms)
+
+
+def get_distance_matrix(tree: KDTree, max_distance: float) -> sparse.COO:
+
+    r"""
+    compute the sparse, symmetric matrix of interatomic distances $d_{ij}$ for all pairs of distinct sites within
+    `max_distance` of each other. pairs are found with `scipy.spatial.KDTree.query_pairs`, and distances are computed
+    under the minimum image convention along the periodic axes of the tree. the edge list is written straight into a
+    `sparse.COO` tensor, so no intermediate dictionary-of-keys or CSR matrix is built.
+
+    Args:
+        tree (scipy.spatial.KDTree):
+            The KDTree to compute distances from. this structure stores lattice positions as well as lattice
+            vectors to encode periodic boundary conditions.
+        max_distance (float):
+            The maximum distance between two sites to include.
+    """
+
+    pairs = tree.query_pairs(r=max_distance, output_type="ndarray")
+    separations = tree.data[pairs[:, 0]] - tree.data[pairs[:, 1]]
+    if tree.boxsize is not None:
+        # scipy marks non-periodic axes with a non-positive box size, so only wrap the periodic ones
+        periodic = tree.boxsize > 0
+        boxsize = tree.boxsize[periodic]
+        separations[:, periodic] -= boxsize * np.round(separations[:, periodic] / boxsize)
+    distances = np.linalg.norm(separations, axis=1)
+
+    return sparse.COO(
+        coords=np.stack([
+            np.concatenate([pairs[:, 0], pairs[:, 1]]),
+            np.concatenate([pairs[:, 1], pairs[:, 0]])
+        ]),
+        data=np.concatenate([distances, distances]),
+        shape=(tree.n, tree.n)
+    )
 
 
 def get_adjacency_tensors(
@@ -63,7 +159,7 @@ def get_adjacency_tensors(
 
     r"""
     compute adjacency tensors $A_{ij}^{(n)}$. we first compute the sparse distance matrix using the
-    `scipy.spatial.KDTree` data structure, and then convert to a `sparse.COO` tensor. then we stack the tensors
+    `scipy.spatial.KDTree` data structure (see `tce.topology.get_distance_matrix`). then we stack the tensors
     according to neighbor order, i.e., $A_{ij}^{(n)} = 1$ if sites $i$ and $j$ are $n$th order neighbors, and $0$ else.
 
     Args:
@@ -78,16 +174,100 @@ def get_adjacency_tensors(
             should be a small number. defaults to $0.01$.
     """
 
-    distances = tree.sparse_distance_matrix(tree, max_distance=(1.0 + tolerance) * cutoffs[-1]).tocsr()
-    distances.eliminate_zeros()
-    distances_sp = sparse.COO.from_scipy_sparse(distances)
+    cutoffs = np.asarray(cutoffs)
+    distances = get_distance_matrix(tree, max_distance=(1.0 + tolerance) * cutoffs[-1])
+
+    # shells are disjoint intervals, so we can bin each distance once rather than masking once per shell
+    lower_bounds, upper_bounds = (1.0 - tolerance) * cutoffs, (1.0 + tolerance) * cutoffs
+    shells = np.searchsorted(lower_bounds, distances.data) - 1
+    in_shell = shells >= 0
+    in_shell[in_shell] = distances.data[in_shell] < upper_bounds[shells[in_shell]]
+
+    return sparse.COO(
+        coords=np.vstack([shells[in_shell], distances.coords[:, in_shell]]),
+        data=np.ones(in_shell.sum(), dtype=bool),
+        shape=(len(cutoffs), *distances.shape)
+    )
+
+
+@njit(cache=True)
+def _intersect_sorted(
+    first: NDArray[np.integer],
+    second: NDArray[np.integer],
+    out: NDArray[np.integer],
+    start: int
+) -> None:
+
+    r"""
+    write the intersection of two sorted index arrays into `out[start:]`
+    """
+
+    a, b, position = 0, 0, start
+    while a < len(first) and b < len(second):
+        if first[a] < second[b]:
+            a += 1
+        elif first[a] > second[b]:
+            b += 1
+        else:
+            out[position] = first[a]
+            a += 1
+            b += 1
+            position += 1
+
+
+@njit(parallel=True, cache=True)
+def enumerate_triangles(
+    closed_indptr: NDArray[np.integer],
+    closed_indices: NDArray[np.integer],
+    offsets: NDArray[np.integer],
+    first_indptr: NDArray[np.integer],
+    first_indices: NDArray[np.integer],
+    second_indptr: NDArray[np.integer],
+    second_indices: NDArray[np.integer],
+    num_sites: int
+) -> NDArray[np.integer]:
 
-    return sparse.stack([
-        sparse.where(
-            sparse.logical_and(distances_sp > (1.0 - tolerance) * c, distances_sp < (1.0 + tolerance) * c),
-            x=True, y=False
-        ) for c in cutoffs
-    ])
+    r"""
+    enumerate the triangles $(i, j, k)$ with $A_{ij}^{(\mathfrak{a})}A_{jk}^{(\mathfrak{b})}A_{ki}^{(\mathfrak{c})} \neq 0$,
+    given the closed pairs $(i, k)$ with $(A^{(\mathfrak{a})}A^{(\mathfrak{b})})_{ik}A_{ki}^{(\mathfrak{c})} \neq 0$.
+    for each closed pair, the intermediate sites $j$ are the intersection of row $i$ of $A^{(\mathfrak{a})}$ and column
+    $k$ of $A^{(\mathfrak{b})}$. each matrix is given in CSR format with sorted indices, and we loop over $i$ in
+    parallel. returns the coordinates $(i, j, k)$ with shape `(3, number of triangles)`.
+
+    Args:
+        closed_indptr (NDArray[np.integer]):
+            Index pointer of the closed pairs.
+        closed_indices (NDArray[np.integer]):
+            Column indices of the closed pairs.
+        offsets (NDArray[np.integer]):
+            Position of the first triangle of each closed pair in the output, i.e. the cumulative number of
+            intermediate sites, with one more entry than there are closed pairs.
+        first_indptr (NDArray[np.integer]):
+            Index pointer of $A^{(\mathfrak{a})}$.
+        first_indices (NDArray[np.integer]):
+            Column indices of $A^{(\mathfrak{a})}$.
+        second_indptr (NDArray[np.integer]):
+            Index pointer of $A^{(\mathfrak{b})}$. adjacency matrices are symmetric, so its rows are its columns.
+        second_indices (NDArray[np.integer]):
+            Column indices of $A^{(\mathfrak{b})}$.
+        num_sites (int):
+            Number of lattice sites.
+    """
+
+    coords = np.empty((3, offsets[-1]), dtype=np.int64)
+    for i in prange(num_sites):
+        for pair in range(closed_indptr[i], closed_indptr[i + 1]):
+            k = closed_indices[pair]
+            coords[0, offsets[pair]:offsets[pair + 1]] = i
+            coords[2, offsets[pair]:offsets[pair + 1]] = k
+            _intersect_sorted(
+                first_indices[first_indptr[i]:first_indptr[i + 1]],
+                second_indices[second_indptr[k]:second_indptr[k + 1]],
+                coords[1],
+                offsets[pair]
+            )
+
+    return coords
 
 
 def get_three_body_tensors(
@@ -116,63 +296,134 @@ def get_three_body_tensors(
     """
 
     try:
-        labels = STRUCTURE_TO_THREE_BODY_LABELS[lattice_structure]
+        all_permutations = STRUCTURE_TO_THREE_BODY_PERMUTATIONS[lattice_structure]
     except KeyError:
-        labels = load_three_body_labels()[lattice_structure]
+        all_permutations = get_three_body_permutations(load_three_body_labels()[lattice_structure])
+    three_body_permutations = all_permutations[:max_three_body_order]
+
+    num_sites = adjacency_tensors.shape[1]
+    csr_matrices = {}
+    # every permutation of a set of labels contains the same neighbor orders, so the first one suffices
+    for order in {order for label_permutations in three_body_permutations for order in label_permutations[0]}:
+        csr = adjacency_tensors[order].to_scipy_sparse().tocsr().astype(np.int32)
+        csr.sort_indices()
+        csr_matrices[order] = csr
+
+    # (A^(a) A^(b))_{ik} counts the paths i -> j -> k, so masking with A^(c)_{ki} gives the number of triangles for
+    # each closed pair (i, k). the products are reused by permutations sharing the first two labels. the adjacency
+    # matrices are symmetric, so A^(c) stands in for its transpose, and the rows of A^(b) for its columns
+    products = {}
+    three_body_tensors = []
+    for label_permutations in three_body_permutations:
+        triplets = []
+        for i, j, k in label_permutations:
+            if (i, j) not in products:
+                products[i, j] = csr_matrices[i] @ csr_matrices[j]
+            closed = products[i, j].multiply(csr_matrices[k]).tocsr()
+            closed.eliminate_zeros()
+            closed.sort_indices()
+            offsets = np.concatenate([[0], np.cumsum(closed.data, dtype=np.int64)])
+            triplets.append(enumerate_triangles(
+                closed.indptr, closed.indices, offsets,
+                csr_matrices[i].indptr, csr_matrices[i].indices,
+                csr_matrices[j].indptr, csr_matrices[j].indices,
+                num_sites
+            ))
+        coords = np.concatenate(triplets, axis=1)
+        three_body_tensors.append(sparse.COO(
+            coords=coords,
+            data=np.ones(coords.shape[1], dtype=np.int8),
+            shape=(num_sites, num_sites, num_sites),
+            has_duplicates=True
+        ))
+
+    return sparse.stack(three_body_tensors)
+
+
+def _as_integer_state_matrix(state_matrix: NDArray) -> NDArray[np.int32]:
+
+    r"""
+    cast a state matrix to `np.int32`, raising a `ValueError` if this would change any of its entries
+    """
+
+    cast = state_matrix.astype(np.int32, copy=False)
+    if not np.array_equal(cast, state_matrix):
+        raise ValueError(NON_INTEGER_STATE_MATRIX_MESSAGE)
+    return cast
 
-    three_body_labels = [
-        labels[order] for order in range(max_three_body_order)
-    ]
 
-    three_body_tensors = sparse.stack([
-        sum(
-            sparse.einsum(
-                "ij,jk,ki->ijk",
-                adjacency_tensors[i],
-                adjacency_tensors[j],
-                adjacency_tensors[k]
-            ) for i, j, k in set(permutations(labels))
-        ) for labels in three_body_labels
-    ])
+def get_adjacency_matrices(adjacency_tensors: sparse.COO) -> list[csr_matrix]:
+
+    r"""
+    split stacked adjacency tensors $A_{ij}^{(n)}$ into one `scipy.sparse.csr_matrix` per neighbor order. the two-body
+    features $N_{\alpha\beta}^{(n)} = (\mathbf{X}^\intercal A^{(n)}\mathbf{X})_{\alpha\beta}$ are then independent sparse-dense
+    matrix products, which dispatch to scipy's compiled CSR kernels. the conversion costs more than the products, so
+    compute these once per topology and reuse them.
+
+    Args:
+        adjacency_tensors (sparse.COO):
+            Adjacency tensors $A_{ij}^{(n)}$ of shape `(number of neighbors, number of sites, number of sites)`.
+    """
 
-    return three_body_tensors
+    return [adjacency_tensor.to_scipy_sparse().tocsr() for adjacency_tensor in adjacency_tensors]
 
 
-def get_feature_vector(adjacency_tensors: sparse.COO,
+def get_feature_vector(adjacency_tensors: Union[sparse.COO, Sequence[csr_matrix]],
     three_body_tensors: sparse.COO,
     state_matrix: NDArray
-) -> NDArray:
+) -> NDArray[np.int32]:
 
     r"""
     topological feature vector $\mathbf{t}$ with components $N_{\alpha\beta}^{(n)} = A_{ij}^{(n)}X_{i\alpha}X_{j\beta}$
-    and $M_{\alpha\beta\gamma}^{(n)} = B_{ijk}^{(n)} X_{i\alpha}X_{j\beta}X_{k\gamma}$.
+    and $M_{\alpha\beta\gamma}^{(n)} = B_{ijk}^{(n)} X_{i\alpha}X_{j\beta}X_{k\gamma}$. the components are cluster
+    counts, so the feature vector is returned as `np.int32`.
 
     Args:
-        adjacency_tensors (sparse.COO):
-            Adjacency tensors $A_{ij}^{(n)}$ of shape `(number of neighbors, number of sites, number of sites)`.
+        adjacency_tensors (Union[sparse.COO, Sequence[csr_matrix]]):
+            Adjacency tensors $A_{ij}^{(n)}$ of shape `(number of neighbors, number of sites, number of sites)`, or
+            the per-neighbor-order matrices computed by `tce.topology.get_adjacency_matrices`. stacked tensors are
+            converted on every call, which costs more than the contraction itself, so pass precomputed matrices when
+            computing feature vectors in a loop.
         three_body_tensors (sparse.COO):
             Three body tensors $B_{ijk}^{(n)}$ of shape
             `(number of neighbors, number of sites, number of sites, number of sites, number of sites)`.
         state_matrix (np.ndarray):
             The state tensor $\mathbf{X}$, defined by $X_{i\alpha} = [\text{site $i$ occupied by type $\alpha$}]$,
-            where $[\cdot]$ is the [Iverson bracket](https://en.wikipedia.org/wiki/Iverson_bracket).
+            where $[\cdot]$ is the [Iverson bracket](https://en.wikipedia.org/wiki/Iverson_bracket). entries must be
+            integer-valued (any dtype), since the state matrix is cast to `np.int32` before contracting. a
+            `ValueError` is raised otherwise.
     """
 
-    return np.concatenate([
-        contract(
-            "nij,iα,jβ->nαβ",
-            adjacency_tensors,
-            state_matrix,
-            state_matrix
-        ).flatten(),
-        contract(
-            "nijk,iα,jβ,kγ->nαβγ",
-            three_body_tensors,
-            state_matrix,
-            state_matrix,
-            state_matrix
-        ).flatten()
-    ])
+    # the topological tensors are boolean or small integers, so only the state matrix sets the accumulator type. int32
+    # comfortably holds cluster counts while moving far fewer bytes than the default float64
+    state_matrix = _as_integer_state_matrix(state_matrix)
+
+    if isinstance(adjacency_tensors, sparse.COO):
+        adjacency_tensors = get_adjacency_matrices(adjacency_tensors)
+
+    three_body_expression = get_contraction_expression(
+        "three_body",
+        three_body_tensors.shape,
+        state_matrix.shape,
+        state_matrix.shape,
+        state_matrix.shape
+    )
+
+    # write both contractions straight into views of a single buffer, rather than flattening and concatenating
+    num_types = state_matrix.shape[1]
+    num_two_body_features = len(adjacency_tensors) * num_types ** 2
+    num_three_body_features = three_body_tensors.shape[0] * num_types ** 3
+    feature_vector = np.empty(num_two_body_features + num_three_body_features, dtype=np.int32)
+
+    two_body_features = feature_vector[:num_two_body_features].reshape(-1, num_types, num_types)
+    for order, adjacency_matrix in enumerate(adjacency_tensors):
+        two_body_features[order] = state_matrix.T @ (adjacency_matrix @ state_matrix)
+    three_body_expression(
+        three_body_tensors, state_matrix, state_matrix, state_matrix,
+        out=feature_vector[num_two_body_features:].reshape(-1, num_types, num_types, num_types)
+    )
+
+    return feature_vector
 
 
 def get_feature_vector_difference(
@@ -180,11 +431,12 @@ def get_feature_vector_difference(
     three_body_tensors: sparse.COO,
     initial_state_matrix: NDArray,
     final_state_matrix: NDArray
-) -> NDArray:
+) -> NDArray[np.int32]:
 
     r"""
     shortcut method for computing feature vector difference
-    $\Delta\mathbf{t} = \mathbf{t}(\mathbf{X}') - \mathbf{t}(\mathbf{X})$ between two nearby states
+    $\Delta\mathbf{t} = \mathbf{t}(\mathbf{X}') - \mathbf{t}(\mathbf{X})$ between two nearby states. like
+    `tce.topology.get_feature_vector`, the difference is returned as `np.int32`.
 
     Args:
         adjacency_tensors (sparse.COO):
@@ -193,60 +445,77 @@ def get_feature_vector_difference(
             Three body tensors $B_{ijk}^{(n)}$ of shape
             `(number of neighbors, number of sites, number of sites, number of sites, number of sites)`.
         initial_state_matrix (NDArray):
-            The initial state tensor $\mathbf{X}$.
+            The initial state tensor $\mathbf{X}$. entries must be integer-valued, else a `ValueError` is raised.
         final_state_matrix (NDArray):
-            The final state tensor $\mathbf{X}'$.
+            The final state tensor $\mathbf{X}'$. entries must be integer-valued, else a `ValueError` is raised.
     """
 
-    sites, _ = np.where(initial_state_matrix != final_state_matrix)
-    sites = np.unique(sites).tolist()
+    initial_state_matrix = _as_integer_state_matrix(initial_state_matrix)
+    final_state_matrix = _as_integer_state_matrix(final_state_matrix)
 
-    truncated_adj = sparse.take(adjacency_tensors, sites, axis=1)
-    initial_feature_vec_truncated = 2 * symmetrize(contract(
-        "nij,iα,jβ->nαβ",
-        truncated_adj,
-        initial_state_matrix[sites, :],
-        initial_state_matrix
-    ), axes=(1, 2)).flatten()
-    final_feature_vec_truncated = 2 * symmetrize(contract(
-        "nij,iα,jβ->nαβ",
+    sites = np.flatnonzero((initial_state_matrix != final_state_matrix).any(axis=1))
+
+    # nothing changed, so skip slicing and contracting entirely
+    if sites.size == 0:
+        num_types = initial_state_matrix.shape[1]
+        return np.zeros(
+            adjacency_tensors.shape[0] * num_types ** 2 + three_body_tensors.shape[0] * num_types ** 3,
+            dtype=np.int32
+        )
+
+    # only the rows of the active sites of the delta state matrix are nonzero, so we expand the difference in terms of
+    # it and contract against the tensors truncated to the active sites. stacking the remaining state matrices along a
+    # leading axis means each truncated tensor is only traversed once
+    truncated_delta = final_state_matrix[sites, :] - initial_state_matrix[sites, :]
+
+    # the truncated adjacency tensors only have a handful of rows, so it is cheaper to contract them densely
+    truncated_adj = sparse.take(adjacency_tensors, sites, axis=1).todense().astype(np.int32)
+    two_body_state_matrices = np.stack([final_state_matrix, initial_state_matrix])
+    two_body_expression = get_contraction_expression(
+        "two_body_delta",
+        truncated_adj.shape,
+        truncated_delta.shape,
+        two_body_state_matrices.shape
+    )
+    two_body_terms = two_body_expression(
         truncated_adj,
-        final_state_matrix[sites, :],
-        final_state_matrix
-    ), axes=(1, 2)).flatten()
+        truncated_delta,
+        two_body_state_matrices
+    )
+
+    # A is symmetric, so the term with the delta in the second slot is a transpose of a truncated contraction
+    two_body_diff = two_body_terms[0] + two_body_terms[1].transpose(0, 2, 1)
 
     truncated_thr = sparse.take(three_body_tensors, sites, axis=1)
-    initial_feature_vec_truncated = np.concatenate(
-        [
-            initial_feature_vec_truncated,
-            3 * symmetrize(contract(
-                "nijk,iα,jβ,kγ->nαβγ",
-                truncated_thr,
-                initial_state_matrix[sites, :],
-                initial_state_matrix,
-                initial_state_matrix
-            ), axes=(1, 2, 3)).flatten()
-        ]
+    second_state_matrices = np.stack([final_state_matrix, initial_state_matrix, initial_state_matrix])
+    third_state_matrices = np.stack([final_state_matrix, final_state_matrix, initial_state_matrix])
+    three_body_expression = get_contraction_expression(
+        "three_body_delta",
+        truncated_thr.shape,
+        truncated_delta.shape,
+        second_state_matrices.shape,
+        third_state_matrices.shape
     )
-    final_feature_vec_truncated = np.concatenate(
-        [
-            final_feature_vec_truncated,
-            3 * symmetrize(contract(
-                "nijk,iα,jβ,kγ->nαβγ",
-                truncated_thr,
-                final_state_matrix[sites, :],
-                final_state_matrix,
-                final_state_matrix
-            ), axes=(1, 2, 3)).flatten()
-        ]
+    three_body_terms = three_body_expression(
+        truncated_thr,
+        truncated_delta,
+        second_state_matrices,
+        third_state_matrices
     )
-    return final_feature_vec_truncated - initial_feature_vec_truncated
+
+    # similarly, B is symmetric, so we can move the delta into the second and third slots with transposes
+    three_body_diff = three_body_terms[0] + \
+        three_body_terms[1].transpose(0, 2, 1, 3) + \
+        three_body_terms[2].transpose(0, 2, 3, 1)
+
+    return np.concatenate([two_body_diff.flatten(), three_body_diff.flatten()])
 
 
-FeatureComputer: TypeAlias = Callable[[Atoms], NDArray[np.floating]]
+FeatureComputer: TypeAlias = Callable[[Atoms], NDArray[np.number]]
 r"""
 Type alias defining a feature computer, which is in general a function that takes in an `ase.Atoms` object and returns a
-feature vector. 
+feature vector. the topological feature computer (see `tce.topology.topological_feature_vector_factory`) returns
+`np.int32` cluster counts, while e.g. intensive feature computers return floats.
 """
 
 def hash_numpy_array(v: NDArray) -> str:
@@ -294,13 +563,13 @@ def topological_feature_vector_factory(basis: ClusterBasis, type_map: NDArray[np
     num_types = len(type_map)
     inverse_type_map = {v: k for k, v in enumerate(type_map)}
 
-    topology_cache: dict[tuple[str, str, ClusterBasis], tuple[sparse.COO, sparse.COO]] = {}
+    topology_cache: dict[tuple[str, str, ClusterBasis], tuple[list[csr_matrix], sparse.COO]] = {}
 
     @wraps(topological_feature_vector_factory)
     def wrapper(atoms: Atoms):
         key = (*hash_topology(atoms), basis)
         if key in topology_cache:
-            adjacency_tensors, three_body_tensors = topology_cache[key]
+            adjacency_matrices, three_body_tensors = topology_cache[key]
             LOGGER.debug(f"topological tensors loaded from cache (key {key})")
         else:
             tree = KDTree(atoms.positions, boxsize=np.diag(atoms.cell))
@@ -314,15 +583,16 @@ def topological_feature_vector_factory(basis: ClusterBasis, type_map: NDArray[np
                 adjacency_tensors=adjacency_tensors,
                 max_three_body_order=basis.max_triplet_order,
             )
-            topology_cache[key] = adjacency_tensors, three_body_tensors
+            adjacency_matrices = get_adjacency_matrices(adjacency_tensors)
+            topology_cache[key] = adjacency_matrices, three_body_tensors
             LOGGER.debug(f"topological tensors computed and stored in cache (key {key})")
 
-        state_matrix = np.zeros((len(atoms), num_types))
+        state_matrix = np.zeros((len(atoms), num_types), dtype=np.int8)
         for site, symbol in enumerate(atoms.symbols):
-            state_matrix[site, inverse_type_map[symbol]] = 1.0
+            state_matrix[site, inverse_type_map[symbol]] = 1
 
         return get_feature_vector(
-            adjacency_tensors=adjacency_tensors,
+            adjacency_tensors=adjacency_matrices,
             three_body_tensors=three_body_tensors,
             state_matrix=state_matrix
         )
@@ -1,4 +1,5 @@
 from typing import Callable
+from itertools import permutations
 import re
 from tempfile import TemporaryDirectory
 from pathlib import Path
@@ -9,12 +10,18 @@ from copy import deepcopy
 import pytest
 import numpy as np
 from numpy.typing import NDArray
+from scipy.spatial import KDTree
 from ase import build
 from ase.calculators.singlepoint import SinglePointCalculator
 import sparse
 
 import tce
-from tce.constants import LatticeStructure, get_three_body_labels, _STRUCTURE_TO_THREE_BODY_LABELS
+from tce.constants import (
+    LatticeStructure,
+    STRUCTURE_TO_THREE_BODY_LABELS,
+    get_three_body_labels,
+    _STRUCTURE_TO_THREE_BODY_LABELS
+)
 from tce.structures import Supercell
 from tce.training import (
     ClusterBasis,
@@ -27,7 +34,7 @@ from tce.training import (
     train,
     difference_train
 )
-from tce.topology import symmetrize
+from tce.topology import symmetrize, get_distance_matrix, NON_INTEGER_STATE_MATRIX_MESSAGE
 from tce.datasets import available_datasets, Dataset
 from tce.calculator import TCECalculator, ASEProperty
 
@@ -68,8 +75,23 @@ def test_num_neighbors(lattice_structure: LatticeStructure, num_expected_neighbo
         assert adj.sum(axis=0).todense().mean() == num_expected_neighbors
 
 
+@pytest.mark.parametrize("periodic_axes", [(True, True, True), (True, True, False), (False, False, False)])
+def test_distance_matrix_equals_scipy_reference(periodic_axes: tuple[bool, bool, bool]):
+
+    atoms = build.bulk("Fe", crystalstructure="bcc", a=2.8, cubic=True).repeat((4, 4, 4))
+    boxsize = np.where(periodic_axes, np.diag(atoms.cell), 0.0) if any(periodic_axes) else None
+    tree = KDTree(atoms.positions, boxsize=boxsize)
+    max_distance = 1.5 * 2.8
+
+    distances = get_distance_matrix(tree, max_distance=max_distance)
+    reference = tree.sparse_distance_matrix(tree, max_distance=max_distance, output_type="coo_matrix")
+
+    assert np.allclose(distances.todense(), reference.toarray())
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, bool, int, float])
 @pytest.mark.parametrize("lattice_structure", [LatticeStructure.SC, LatticeStructure.BCC, LatticeStructure.FCC])
-def test_feature_vector_shortcut(lattice_structure: LatticeStructure, get_supercell):
+def test_feature_vector_shortcut(lattice_structure: LatticeStructure, dtype: type, get_supercell):
 
     rng = np.random.default_rng(seed=0)
     num_types = 3
@@ -78,7 +100,7 @@ def test_feature_vector_shortcut(lattice_structure: LatticeStructure, get_superc
 
     types = rng.integers(num_types, size=supercell.num_sites)
 
-    state_matrix = np.zeros((supercell.num_sites, num_types), dtype=int)
+    state_matrix = np.zeros((supercell.num_sites, num_types), dtype=dtype)
     state_matrix[np.arange(supercell.num_sites), types] = 1
 
     new_state_matrix = state_matrix.copy()
@@ -106,6 +128,81 @@ def test_feature_vector_shortcut(lattice_structure: LatticeStructure, get_superc
     naive_diff = new_feature_vector - feature_vector
 
     assert np.all(naive_diff == clever_diff)
+    assert clever_diff.dtype == feature_vector.dtype
+
+
+@pytest.mark.parametrize("lattice_structure", [LatticeStructure.SC, LatticeStructure.BCC, LatticeStructure.FCC])
+def test_feature_vector_shortcut_neighboring_sites(lattice_structure: LatticeStructure, get_supercell):
+
+    rng = np.random.default_rng(seed=0)
+    num_types = 3
+
+    supercell = get_supercell(lattice_structure)
+
+    types = rng.integers(num_types, size=supercell.num_sites)
+
+    state_matrix = np.zeros((supercell.num_sites, num_types), dtype=int)
+    state_matrix[np.arange(supercell.num_sites), types] = 1
+
+    # cycle the types of a site and two of its nearest neighbors, so the active sites share bonds and triplets
+    first_site = 0
+    second_site, third_site = supercell.adjacency_tensors(max_order=1)[0, first_site].coords[0][:2]
+    new_state_matrix = state_matrix.copy()
+    new_state_matrix[[first_site, second_site, third_site], :] = state_matrix[[second_site, third_site, first_site], :]
+
+    clever_diff = supercell.clever_feature_diff(
+        state_matrix, new_state_matrix,
+        max_adjacency_order=2, max_triplet_order=2
+    )
+
+    naive_diff = supercell.feature_vector(
+        new_state_matrix,
+        max_adjacency_order=2,
+        max_triplet_order=2
+    ) - supercell.feature_vector(
+        state_matrix,
+        max_adjacency_order=2,
+        max_triplet_order=2
+    )
+
+    assert np.all(naive_diff == clever_diff)
+
+
+def test_feature_vector_shortcut_unchanged_state(get_supercell):
+
+    rng = np.random.default_rng(seed=0)
+    num_types = 3
+
+    supercell = get_supercell(LatticeStructure.BCC)
+
+    state_matrix = np.zeros((supercell.num_sites, num_types), dtype=int)
+    state_matrix[np.arange(supercell.num_sites), rng.integers(num_types, size=supercell.num_sites)] = 1
+
+    clever_diff = supercell.clever_feature_diff(
+        state_matrix, state_matrix.copy(),
+        max_adjacency_order=2, max_triplet_order=2
+    )
+
+    assert clever_diff.shape == (2 * num_types ** 2 + 2 * num_types ** 3,)
+    assert not np.any(clever_diff)
+
+
+def test_non_integer_state_matrix_raises_value_error(get_supercell):
+
+    supercell = get_supercell(LatticeStructure.BCC)
+
+    state_matrix = np.zeros((supercell.num_sites, 2))
+    state_matrix[:, 0] = 1.0
+    new_state_matrix = np.full_like(state_matrix, 0.5)
+
+    with pytest.raises(ValueError, match=NON_INTEGER_STATE_MATRIX_MESSAGE):
+        _ = supercell.feature_vector(new_state_matrix, max_adjacency_order=2, max_triplet_order=2)
+
+    with pytest.raises(ValueError, match=NON_INTEGER_STATE_MATRIX_MESSAGE):
+        _ = supercell.clever_feature_diff(
+            state_matrix, new_state_matrix,
+            max_adjacency_order=2, max_triplet_order=2
+        )
 
 
 def test_noncubic_cell_raises_value_error():
@@ -215,6 +312,16 @@ def test_symmetrization_no_axes():
     assert np.all(symmetrize(x).todense() == x_symmetrized.todense())
 
 
+def test_symmetrization_dense_matches_sparse():
+
+    rng = np.random.default_rng(seed=0)
+    x = rng.random((2, 3, 3, 3))
+
+    x_symmetrized = symmetrize(x, axes=(1, 2, 3))
+    assert np.allclose(x_symmetrized, symmetrize(sparse.COO.from_numpy(x), axes=(1, 2, 3)).todense())
+    assert np.allclose(x_symmetrized, x_symmetrized.transpose(0, 2, 1, 3))
+
+
 def test_limiting_ridge_throws_error():
 
     lr = LimitingRidge()
@@ -277,6 +384,28 @@ def test_computed_labels_equal_cached_labels(lattice_structure: LatticeStructure
     assert np.all(cached == loaded)
 
 
+@pytest.mark.parametrize("lattice_structure", [LatticeStructure.SC, LatticeStructure.BCC, LatticeStructure.FCC])
+def test_three_body_tensors_equal_einsum_reference(lattice_structure: LatticeStructure, get_supercell):
+
+    supercell = get_supercell(lattice_structure)
+    labels = STRUCTURE_TO_THREE_BODY_LABELS[lattice_structure]
+    three_body_tensors = supercell.three_body_tensors(max_order=len(labels))
+    adjacency_tensors = supercell.adjacency_tensors(max_order=labels.max() + 1)
+
+    for three_body_tensor, label in zip(three_body_tensors, labels):
+        reference = sum(
+            (sparse.einsum(
+                "ij,jk,ki->ijk",
+                adjacency_tensors[i],
+                adjacency_tensors[j],
+                adjacency_tensors[k]
+            ) for i, j, k in set(permutations(label))),
+            start=sparse.COO(coords=[], shape=three_body_tensor.shape)
+        )
+        assert np.array_equal(three_body_tensor.coords, reference.coords)
+        assert np.array_equal(three_body_tensor.data, reference.data)
+
+
 @pytest.mark.parametrize("dataset_str", available_datasets())
 def test_can_train_and_attach_calculator(dataset_str):
 